@@ -1,32 +1,247 @@
 import os
+import collections
+import ctypes.util
 import errno
-import json
+import functools
+import queue
+import re
+import subprocess
 import sys
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import wave
-
+import ctranslate2
 import ffmpeg
+import numpy as np
+import orjson
 import argostranslate.translate
 import argostranslate.package
+import argostranslate.settings
 from PyQt5 import QtWidgets
-from PyQt5.QtCore import QStandardPaths, QObject, pyqtSignal, QUrl, QSettings, Qt
+from PyQt5.QtCore import QStandardPaths, QObject, pyqtSignal, QUrl, QSettings, Qt, QRunnable, QThreadPool, QTimer
 from PyQt5.QtMultimedia import QMediaPlayer, QMediaContent
 from PyQt5.QtMultimediaWidgets import QVideoWidget
 from PyQt5.QtWidgets import QFileDialog, QSizePolicy, QPushButton
 from fsspec.utils import seek_delimiter
 from vosk import Model, KaldiRecognizer
 
+try:
+    from vosk import BatchModel, BatchRecognizer, GpuInit, GpuThreadInit
+    _HAS_BATCH = True
+except ImportError:
+    _HAS_BATCH = False
+
+
+DEFAULT_MODEL = "vosk-model-fr-0.22"
+SAMPLE_RATE = 16000
+SEGMENT_SECONDS = 60
+SPLIT_WINDOW_SECONDS = 10
+RMS_WINDOW = SAMPLE_RATE // 10
+CHUNK_BYTES = 2 * SAMPLE_RATE * 2
+SILENCE_RMS = 100
+SILENCE_CHUNKS = 2
+STDERR_TAIL_LINES = 20
+BUFFER_SIZE = 1 << 20
+PIPELINE_QUEUE_SIZE = 4
+BATCH_PENDING_CHUNKS = 16
+BATCH_POLL_SECONDS = 0.01
+TRANSLATION_COMPUTE_TYPE = "int8"
+TRANSLATION_REPLICAS = max(1, (os.cpu_count() or 1) // 2)
+POSITION_POLL_INTERVAL = 250
+
+HARDWARE_ENCODERS = (
+    ("h264_nvenc", {"preset": "p4", "tune": "hq"}),
+    ("h264_qsv", {"preset": "veryfast"}),
+    ("h264_videotoolbox", {}),
+)
+SOFTWARE_ENCODER = ("libx264", {"preset": "veryfast", "crf": 23})
+
+_PROGRESS_LINE = re.compile(r"^[\w.]+=\S*$")
+_SRT_BLOCK_SEPARATOR = re.compile(r"\n\s*\n")
+
+_MODEL_CACHE = {}
+_BATCH_MODEL_CACHE = {}
+_MODEL_LOCK = threading.Lock()
+
+_TRANSLATION_CACHE = {}
+_TRANSLATION_LOCK = threading.Lock()
+_INSTALL_LOCK = threading.Lock()
+
+
+class ProcessingCancelled(Exception):
+    pass
+
+
+def load_model(name):
+    with _MODEL_LOCK:
+        if name not in _MODEL_CACHE:
+            _MODEL_CACHE[name] = Model("models/" + name)
+        return _MODEL_CACHE[name]
+
+
+def gpu_available():
+    return _HAS_BATCH and ctypes.util.find_library("cuda") is not None
+
+
+def load_batch_model(name):
+    with _MODEL_LOCK:
+        if name not in _BATCH_MODEL_CACHE:
+            try:
+                if not _BATCH_MODEL_CACHE:
+                    GpuInit()
+                _BATCH_MODEL_CACHE[name] = BatchModel("models/" + name)
+            except Exception:
+                _BATCH_MODEL_CACHE[name] = None
+        return _BATCH_MODEL_CACHE[name]
+
+
+def preload_model(name):
+    if gpu_available() and load_batch_model(name) is not None:
+        return
+    load_model(name)
+
+
+def _quantize_translation(translation):
+    package_translation = getattr(translation, "underlying", translation)
+    package = getattr(package_translation, "pkg", None)
+    if package is None:
+        return translation
+    package_translation.translator = ctranslate2.Translator(
+        str(package.package_path / "model"),
+        device = argostranslate.settings.device,
+        compute_type = TRANSLATION_COMPUTE_TYPE,
+        inter_threads = TRANSLATION_REPLICAS,
+        intra_threads = max(1, (os.cpu_count() or 1) // TRANSLATION_REPLICAS)
+    )
+    return package_translation
+
+
+def load_translation(from_code, to_code):
+    with _TRANSLATION_LOCK:
+        key = (from_code, to_code)
+        if key not in _TRANSLATION_CACHE:
+            translation = argostranslate.translate.get_translation_from_codes(from_code, to_code)
+            _TRANSLATION_CACHE[key] = _quantize_translation(translation)
+        return _TRANSLATION_CACHE[key]
+
+
+def _find_split(samples):
+    end = SEGMENT_SECONDS * SAMPLE_RATE
+    start = end - SPLIT_WINDOW_SECONDS * SAMPLE_RATE
+    windows = samples[start:end].astype(np.int32).reshape(-1, RMS_WINDOW)
+    rms = np.sqrt((windows ** 2).mean(axis = 1))
+    return start + int(rms.argmin()) * RMS_WINDOW + RMS_WINDOW // 2
+
+
+def _split_segments(blocks, stopped):
+    segment = SEGMENT_SECONDS * SAMPLE_RATE
+    buffer = b""
+    offset = 0
+    for block in blocks:
+        buffer += block
+        while len(buffer) // 2 > segment:
+            split = _find_split(np.frombuffer(buffer, dtype = np.int16, count = segment))
+            yield offset, buffer[:split * 2]
+            buffer = buffer[split * 2:]
+            offset += split
+    if buffer and not stopped.is_set():
+        yield offset, buffer
+
+
+def _append_cue(cues, raw_result, offset, confidence):
+    # Cheap pre-filter: results without a "result" word list carry no words to parse.
+    if '"result"' not in raw_result:
+        return
+    result = orjson.loads(raw_result)
+    words = result.get("result")
+    if words:
+        text = " ".join(word["word"] for word in words if word["conf"] > confidence)
+        cues.append((words[0]["start"] + offset, words[-1]["end"] + offset, text))
+
+
+def _recognize_segment(segment, stopped):
+    model_name, pcm, offset, confidence = segment
+    recognizer = KaldiRecognizer(load_model(model_name), SAMPLE_RATE)
+    recognizer.SetWords(True)
+    recognizer.SetMaxAlternatives(0)
+    cues = []
+    samples = np.frombuffer(pcm, dtype = np.int16)
+    chunk_samples = CHUNK_BYTES // 2
+    silent_chunks = 0
+    skipped = 0
+    for chunk_start in range(0, len(samples), chunk_samples):
+        if stopped.is_set():
+            return cues
+        chunk = samples[chunk_start:chunk_start + chunk_samples]
+        rms = np.sqrt(np.mean(chunk.astype(np.int32) ** 2))
+        silent_chunks = silent_chunks + 1 if rms < SILENCE_RMS else 0
+        if silent_chunks > SILENCE_CHUNKS:
+            if silent_chunks == SILENCE_CHUNKS + 1:
+                _append_cue(cues, recognizer.FinalResult(), offset + skipped, confidence)
+            skipped += len(chunk) / SAMPLE_RATE
+            continue
+        if recognizer.AcceptWaveform(chunk.tobytes()):
+            _append_cue(cues, recognizer.Result(), offset + skipped, confidence)
+    _append_cue(cues, recognizer.FinalResult(), offset + skipped, confidence)
+    return cues
+
+
+@functools.lru_cache(maxsize = None)
+def available_encoders():
+    try:
+        output = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output = True,
+            text = True,
+            check = True
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return frozenset()
+    return frozenset(
+        fields[1] for fields in (line.split() for line in output.splitlines()) if len(fields) > 1
+    )
+
+
+def video_encoders():
+    encoders = available_encoders()
+    return [
+        (name, options) for name, options in HARDWARE_ENCODERS if name in encoders
+    ] + [SOFTWARE_ENCODER]
+
+
+def parse_srt(srt):
+    cues = []
+    for block in _SRT_BLOCK_SEPARATOR.split(srt.strip()):
+        lines = block.strip().split("\n")
+        if len(lines) >= 2:
+            cues.append((lines[0], lines[1], "\n".join(lines[2:])))
+    return cues
+
+
+def format_srt(cues):
+    return "\n".join(f"{index}\n{timing}\n{text}\n" for index, timing, text in cues)
+
 
 class ProcessVideo:
-    def __init__(self, video, srt_path, save_dir, model = "vosk-model-fr-0.22"):
+    def __init__(self, video, srt_path, save_dir, model = DEFAULT_MODEL, progress = None):
         self.video = video
         self.model = model
         self.confidence = 0.6
         self._video_exits()
         self.video_dir = save_dir
         self.srt_path = srt_path
+        self._stem = Path(video).stem
+        self._srt = Path(save_dir) / f"{self._stem}.srt"
+        self.progress = progress
+        self.cancelled = False
+        self._cancel_lock = threading.Lock()
+        self._stderr_tail = collections.deque(maxlen = STDERR_TAIL_LINES)
+        self._stderr_reader = None
+        self._duration_seconds = None
+        self._process = None
+        self._pipeline = None
 
 
     def _video_exits(self):
@@ -47,98 +262,326 @@ class ProcessVideo:
             )
 
 
-    def _format_timestamp(self, seconds):
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        secs = seconds % 60
-        return f"{hours:02d}:{minutes:02d}:{secs:06.3f}".replace('.', ',')
+    def _format_timestamps(self, seconds):
+        millis = np.rint(np.asarray(seconds, dtype = np.float64) * 1000).astype(np.int64)
+        return [
+            f"{hours:02d}:{minutes:02d}:{secs:02d},{ms:03d}"
+            for hours, minutes, secs, ms in zip(
+                (millis // 3600000).tolist(),
+                (millis // 60000 % 60).tolist(),
+                (millis // 1000 % 60).tolist(),
+                (millis % 1000).tolist()
+            )
+        ]
 
 
-    def _save_srt(self, subtitles):
-        srt_file = os.path.join(self.video_dir, f"{os.path.basename(self.video)[:-4]}.srt")
-        with open(srt_file, "w", encoding = "utf-8") as f:
-            for subtitle in subtitles:
-                f.write(subtitle + "\n")
-        return srt_file
+    def _save_srt(self, srt_body):
+        with open(self._srt, "wb", buffering = BUFFER_SIZE) as f:
+            f.write(srt_body.encode("utf-8"))
+        return str(self._srt)
 
 
     def _cleanup(self):
-        base_name = os.path.basename(self.video)[:-4]
-        srt_file = os.path.join(self.video_dir, f"{base_name}.srt")
-        wav_file = os.path.join(self.video_dir, f"{base_name}.wav")
-        if os.path.exists(srt_file):
-            os.remove(srt_file)
-        if os.path.exists(wav_file):
-            os.remove(wav_file)
+        if self._srt.exists():
+            self._srt.unlink()
+
+
+    def _report_progress(self, value):
+        if self.progress:
+            self.progress(int(value))
+
+
+    def _duration(self):
+        if self._duration_seconds is None:
+            try:
+                self._duration_seconds = float(ffmpeg.probe(self.video)["format"]["duration"])
+            except (ffmpeg.Error, OSError, KeyError, ValueError):
+                self._duration_seconds = 0
+        return self._duration_seconds
+
+
+    def _read_stderr(self, stderr, duration, scale):
+        for raw_line in stderr:
+            line = raw_line.decode("utf-8", errors = "replace").strip()
+            if not line:
+                continue
+            if not _PROGRESS_LINE.match(line):
+                self._stderr_tail.append(line)
+            elif line.startswith("out_time_ms=") and duration:
+                value = line.split("=", 1)[1]
+                if value.isdigit():
+                    percent = min(100, int(value) / 1000000 / duration * 100)
+                    self._report_progress(percent * scale)
+
+
+    def _spawn(self, stream, pipe_stdout = False, scale = 1):
+        duration = self._duration()
+        args = (
+            stream.global_args(
+                '-loglevel', 'error',
+                '-nostats',
+                '-progress', 'pipe:2',
+            ).compile(
+            )
+        )
+        with self._cancel_lock:
+            if self.cancelled:
+                raise ProcessingCancelled("Processing cancelled")
+            process = subprocess.Popen(
+                args,
+                stdout = subprocess.PIPE if pipe_stdout else subprocess.DEVNULL,
+                stderr = subprocess.PIPE,
+                bufsize = BUFFER_SIZE
+            )
+            self._process = process
+        self._stderr_tail.clear()
+        self._stderr_reader = threading.Thread(
+            target = self._read_stderr,
+            args = (process.stderr, duration, scale),
+            daemon = True
+        )
+        self._stderr_reader.start()
+        return process
+
+
+    def _wait(self, process):
+        process.wait()
+        self._stderr_reader.join()
+        if process.returncode != 0:
+            raise ffmpeg.Error('ffmpeg', None, "\n".join(self._stderr_tail).encode("utf-8"))
 
 
     def extract_audio(self):
-        output_file = os.path.join(self.video_dir, f"{os.path.basename(self.video)[:-4]}.wav")
-        (
+        stream = (
             ffmpeg.input(
                 self.video,
-            ).output(output_file,
-                    format = 'wav',
+            ).output('pipe:',
+                    format = 's16le',
                     acodec = 'pcm_s16le',
                     ac = 1,
                     ar = '16000',
-                    af = '''
-                        highpass=f=200,
-                        lowpass=f=3500,
-                        afftdn=nf=-20,
-                    ''',
-            ).overwrite_output(
-            ).run(
+                    af = "highpass=f=200,lowpass=f=3500,afftdn=nf=-20",
+                    threads = 0,
+            ).global_args(
+                '-filter_threads', str(os.cpu_count()),
             )
         )
+        return self._spawn(stream, pipe_stdout = True, scale = 0.5)
 
 
     def retrieve_text(self):
-        model = Model("models/" + self.model)
-        recognizer = KaldiRecognizer(model, 16000)
-        recognizer.SetWords(True)
-        subtitles = []
-        subtitles_index = 1
-        wav_file = os.path.join(self.video_dir, f"{os.path.basename(self.video)[:-4]}.wav")
-        with wave.open(wav_file, 'rb') as wf:
-            while True:
-                data = wf.readframes(4000)
-                if not data:
-                    break
-                if recognizer.AcceptWaveform(data):
-                    result = json.loads(recognizer.Result())
-                    if "result" in result:
-                        words = result["result"]
-                        if words:
-                            start = self._format_timestamp(words[0]["start"])
-                            end = self._format_timestamp(words[-1]["end"])
-                            text = " ".join([word["word"] for word in words if (word["conf"] > self.confidence)])
-                            subtitles.append(f"{subtitles_index}\n{start} --> {end}\n{text}\n")
-                            subtitles_index += 1
-        os.remove(wav_file)
-        return self._save_srt(subtitles)
-
-
-    def burn_subtitles(self):
-        srt_path = self.srt_path
-        output_video_path = self.video_dir
-        (
-            ffmpeg.input(
-                self.video,
-            ).output(output_video_path,
-                    vf = f"subtitles={srt_path}",
-                    vcodec = 'libx264',
-                    acodec = 'copy'
+        self._pipeline = TranscodePipeline(self)
+        return self._pipeline.run()
+
+
+    def cancel(self):
+        with self._cancel_lock:
+            self.cancelled = True
+            if self._pipeline is not None:
+                self._pipeline.stopped.set()
+            if self._process is not None and self._process.poll() is None:
+                self._process.terminate()
+
+
+    def _format_srt(self, cues):
+        starts = self._format_timestamps([start for start, _, _ in cues])
+        ends = self._format_timestamps([end for _, end, _ in cues])
+        subtitles = [
+            f"{index}\n{start} --> {end}\n{text}\n"
+            for index, (start, end, (_, _, text)) in enumerate(zip(starts, ends, cues), 1)
+        ]
+        return "\n".join(subtitles) + "\n"
+
+
+    def burn_subtitles(self, soft = False):
+        if soft:
+            self._mux_subtitles()
+        else:
+            self._burn_subtitles()
+        self._cleanup()
+
+
+    def _mux_subtitles(self):
+        video = ffmpeg.input(self.video)
+        stream = (
+            ffmpeg.output(
+                video['v'],
+                video['a?'],
+                ffmpeg.input(self.srt_path)['s'],
+                self.video_dir,
+                vcodec = 'copy',
+                acodec = 'copy',
+                scodec = 'mov_text'
             ).overwrite_output(
-            ).run(
             )
         )
-        self._cleanup()
+        self._wait(self._spawn(stream))
+
+
+    def _burn_subtitles(self):
+        srt_path = self.srt_path
+        output_video_path = self.video_dir
+        encoders = video_encoders()
+        for vcodec, options in encoders:
+            stream = (
+                ffmpeg.input(
+                    self.video,
+                ).output(output_video_path,
+                        vf = f"subtitles={srt_path}",
+                        vcodec = vcodec,
+                        acodec = 'copy',
+                        **options
+                ).overwrite_output(
+                )
+            )
+            try:
+                self._wait(self._spawn(stream))
+                return
+            except ffmpeg.Error:
+                if self.cancelled or vcodec == encoders[-1][0]:
+                    raise
+
+
+class TranscodePipeline:
+    def __init__(self, video_process):
+        self.video_process = video_process
+        self.blocks = queue.Queue(maxsize = PIPELINE_QUEUE_SIZE)
+        self.stopped = threading.Event()
+
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers = 1) as extractor, \
+                ThreadPoolExecutor(max_workers = 1) as recognizer:
+            extracted = extractor.submit(self._extract)
+            recognized = recognizer.submit(self._recognize)
+            cues = recognized.result()
+            extracted.result()
+            if self.stopped.is_set():
+                raise ProcessingCancelled("Processing cancelled")
+        srt_body = self.video_process._format_srt(cues)
+        return self.video_process._save_srt(srt_body), srt_body
+
+
+    def _put(self, block):
+        while not self.stopped.is_set():
+            try:
+                self.blocks.put(block, timeout = 0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+
+    def _blocks(self):
+        while not self.stopped.is_set():
+            try:
+                block = self.blocks.get(timeout = 0.1)
+            except queue.Empty:
+                continue
+            if block is None:
+                return
+            yield block
+
+
+    def _extract(self):
+        try:
+            process = self.video_process.extract_audio()
+            for block in iter(functools.partial(process.stdout.read, BUFFER_SIZE), b""):
+                if not self._put(block):
+                    process.kill()
+                    break
+            self.video_process._wait(process)
+        except BaseException:
+            self.stopped.set()
+            raise
+        self._put(None)
+
+
+    def _recognize(self):
+        try:
+            model = load_batch_model(self.video_process.model) if gpu_available() else None
+            if model is not None:
+                return self._recognize_batch(model)
+            return self._recognize_pool()
+        except BaseException:
+            self.stopped.set()
+            raise
+
+
+    def _recognize_pool(self):
+        video_process = self.video_process
+        load_model(video_process.model)
+        with ThreadPoolExecutor(max_workers = os.cpu_count()) as executor:
+            pending = [
+                executor.submit(
+                    _recognize_segment,
+                    (video_process.model, pcm, offset / SAMPLE_RATE, video_process.confidence),
+                    self.stopped
+                )
+                for offset, pcm in _split_segments(self._blocks(), self.stopped)
+            ]
+            cues = []
+            for done, future in enumerate(pending, 1):
+                if self.stopped.is_set():
+                    executor.shutdown(cancel_futures = True)
+                    return []
+                cues.extend(future.result())
+                video_process._report_progress(50 + 50 * done / len(pending))
+            return cues
+
+
+    def _recognize_batch(self, model):
+        video_process = self.video_process
+        GpuThreadInit()
+        streams = []
+        for offset, pcm in _split_segments(self._blocks(), self.stopped):
+            recognizer = BatchRecognizer(model, SAMPLE_RATE)
+            for chunk_start in range(0, len(pcm), CHUNK_BYTES):
+                if not self._wait_pending(recognizer, BATCH_PENDING_CHUNKS):
+                    return []
+                recognizer.AcceptWaveform(pcm[chunk_start:chunk_start + CHUNK_BYTES])
+            recognizer.FinishStream()
+            streams.append((offset / SAMPLE_RATE, recognizer))
+        segment_cues = [[] for _ in streams]
+        for done, (offset, recognizer) in enumerate(streams, 1):
+            if not self._wait_pending(recognizer, 1):
+                return []
+            for result in iter(recognizer.Result, ""):
+                _append_cue(segment_cues[done - 1], result, offset, video_process.confidence)
+            video_process._report_progress(50 + 50 * done / len(streams))
+        model.Wait()
+        cues = []
+        for (offset, recognizer), segment in zip(streams, segment_cues):
+            for result in iter(recognizer.Result, ""):
+                _append_cue(segment, result, offset, video_process.confidence)
+            cues.extend(segment)
+        return cues
+
+
+    def _wait_pending(self, recognizer, limit):
+        while recognizer.GetPendingChunks() >= limit:
+            if self.stopped.is_set():
+                return False
+            time.sleep(BATCH_POLL_SECONDS)
+        return not self.stopped.is_set()
 
 
 class Translator:
     def __init__(self):
-        pass
+        with _INSTALL_LOCK:
+            if not self.packages_installed():
+                self.install_packages()
+
+
+    def packages_installed(self):
+        if ("fr", "en") in _TRANSLATION_CACHE:
+            return True
+        languages = {
+            language.code: language for language in argostranslate.translate.get_installed_languages()
+        }
+        if "fr" not in languages or "en" not in languages:
+            return False
+        return languages["fr"].get_translation(languages["en"]) is not None
 
 
     def install_packages(self):
@@ -153,8 +596,17 @@ class Translator:
 
 
     def translate(self, text):
-        translation = argostranslate.translate.translate(text, "fr", "en")
-        return translation
+        return load_translation("fr", "en").translate(text)
+
+
+    def translate_srt(self, srt):
+        cues = parse_srt(srt)
+        load_translation("fr", "en")
+        with ThreadPoolExecutor(max_workers = TRANSLATION_REPLICAS) as executor:
+            translated = list(executor.map(self.translate, [text for _, _, text in cues]))
+        return format_srt(
+            (index, timing, text) for (index, timing, _), text in zip(cues, translated)
+        )
 
 
 
@@ -165,6 +617,7 @@ class MainWindow(QtWidgets.QMainWindow):
         QtWidgets.QApplication.setApplicationName("TransFlix")
         self.settings = QSettings()
         self.video_path = None
+        self.video_process = None
         default_save_dir = QStandardPaths.writableLocation(QStandardPaths.DocumentsLocation)
         self.save_dir = self.settings.value("save_dir", default_save_dir)
         self.signals = Signals()
@@ -172,6 +625,20 @@ class MainWindow(QtWidgets.QMainWindow):
         center_window(self)
         self.signals.finished.connect(self.on_processing_finished)
         self.signals.error.connect(self.on_processing_error)
+        self.signals.progress.connect(self.on_processing_progress)
+        threading.Thread(
+            target = preload_model,
+            args = (DEFAULT_MODEL, ),
+            daemon = True
+        ).start()
+        threading.Thread(
+            target = available_encoders,
+            daemon = True
+        ).start()
+        threading.Thread(
+            target = lambda: Translator().translate("bonjour"),
+            daemon = True
+        ).start()
 
 
     def initUI(self):
@@ -223,42 +690,59 @@ class MainWindow(QtWidgets.QMainWindow):
             self.button_process.setEnabled(False)
             self.progress_dialog = QtWidgets.QProgressDialog(
                 "Processing",
-                None,
-                0,
+                "Cancel",
                 0,
+                100,
                 self
             )
+            self.progress_dialog.canceled.connect(self.cancel_processing)
             self.progress_dialog.show()
-            thread = threading.Thread(
-                target = self.run_processing,
-                args = (self.video_path, self.save_dir),
-                daemon = True
-            )
-            thread.start()
-
-
-    def run_processing(self, video_path, save_dir):
+            self.video_process = None
+            try:
+                self.video_process = ProcessVideo(
+                    self.video_path,
+                    None,
+                    self.save_dir,
+                    progress = self.signals.progress.emit
+                )
+            except Exception as e:
+                self.on_processing_error(error_message(e))
+                return
+            QThreadPool.globalInstance().start(ProcessRunnable(self.run_processing))
+
+
+    def run_processing(self):
         try:
-            videoProcess = ProcessVideo(video_path, None, save_dir)
-            videoProcess.extract_audio()
-            srt_path = videoProcess.retrieve_text()
+            srt_path, srt_body = self.video_process.retrieve_text()
             print(srt_path)
-            self.signals.finished.emit(srt_path)
+            self.signals.finished.emit(srt_path, srt_body)
         except Exception as e:
-            self.signals.error.emit(str(e))
+            self.signals.error.emit(error_message(e))
+
+
+    def cancel_processing(self):
+        if self.video_process is not None:
+            self.video_process.cancel()
+
+
+    def on_processing_progress(self, value):
+        self.progress_dialog.setValue(value)
 
 
-    def on_processing_finished(self, srt_path):
+    def on_processing_finished(self, srt_path, srt_body):
         self.progress_dialog.close()
         self.button_process.setEnabled(True)
-        self.preview_window = PreviewWindow(self.video_path, srt_path, self.save_dir, self)
+        self.preview_window = PreviewWindow(self.video_path, srt_path, srt_body, self.save_dir, self)
         self.preview_window.show()
         self.hide()
 
 
     def on_processing_error(self, error_msg):
+        cancelled = self.video_process is not None and self.video_process.cancelled
         self.progress_dialog.close()
         self.button_process.setEnabled(True)
+        if cancelled:
+            return
         QtWidgets.QMessageBox.critical(
             self,
             "Error",
@@ -291,14 +775,17 @@ class MainWindow(QtWidgets.QMainWindow):
 
 
 class PreviewWindow(QtWidgets.QMainWindow):
-    def __init__(self, video_path, srt_path, save_dir, main_window):
+    def __init__(self, video_path, srt_path, srt_body, save_dir, main_window):
         super().__init__()
         self.video_path = video_path
         self.srt_path = srt_path
+        self.srt_body = srt_body
         self.save_dir = save_dir
         self.main_window = main_window
+        self.video_process = None
         self.signals = Signals()
         self.signals.burn_finished.connect(self.on_burn_finished)
+        self.signals.progress.connect(self.on_burn_progress)
         self.media_player = QMediaPlayer()
         self.initUI()
         self.showMaximized()
@@ -316,7 +803,6 @@ class PreviewWindow(QtWidgets.QMainWindow):
         layout.addWidget(self.video_widget, stretch = 3)
         self.media_player.setMedia(QMediaContent(QUrl.fromLocalFile(self.video_path)))
         self.media_player.setVolume(50)
-        self.media_player.positionChanged.connect(self.update_slider)
         self.media_player.play()
 
         self.sliders_layout = QtWidgets.QHBoxLayout()
@@ -342,6 +828,11 @@ class PreviewWindow(QtWidgets.QMainWindow):
         self.seek_slider.sliderMoved.connect(self.set_position)
         self.sliders_layout.addWidget(self.seek_slider, stretch = 10)
 
+        self.position_timer = QTimer(self)
+        self.position_timer.setInterval(POSITION_POLL_INTERVAL)
+        self.position_timer.timeout.connect(lambda: self.update_slider(self.media_player.position()))
+        self.position_timer.start()
+
         self.separator = QtWidgets.QLabel("|")
         self.sliders_layout.addWidget(self.separator)
 
@@ -366,10 +857,12 @@ class PreviewWindow(QtWidgets.QMainWindow):
 
         self.text_edit = QtWidgets.QTextEdit()
         self.text_edit.setFontPointSize(16)
-        with open(self.srt_path, "r") as f:
-            self.text_edit.setText(f.read())
+        self.text_edit.setText(self.srt_body)
         layout.addWidget(self.text_edit, stretch = 2)
 
+        self.checkbox_soft = QtWidgets.QCheckBox("Soft subtitles (fast)")
+        layout.addWidget(self.checkbox_soft)
+
         self.button_finish = QtWidgets.QPushButton("Finish and Burn")
         self.button_finish.clicked.connect(self.start_burning)
         layout.addWidget(self.button_finish)
@@ -413,6 +906,8 @@ class PreviewWindow(QtWidgets.QMainWindow):
 
 
     def update_slider(self, position):
+        if self.seek_slider.isSliderDown():
+            return
         if self.media_player.duration() > 0:
             self.seek_slider.setValue(int((position / self.media_player.duration()) * 100))
 
@@ -426,40 +921,53 @@ class PreviewWindow(QtWidgets.QMainWindow):
         self.media_player.stop()
         edited_srt = self.text_edit.toPlainText()
         translator = Translator()
-        translated_srt = translator.translate(edited_srt)
-        with open(self.srt_path, "w") as f:
+        translated_srt = translator.translate_srt(edited_srt)
+        with open(self.srt_path, "w", buffering = BUFFER_SIZE, encoding = "utf-8") as f:
             f.write(translated_srt)
         input_path = Path(self.video_path)
         output_file = f"{input_path.stem}_subtitled{input_path.suffix}"
         output_path = str(Path(self.save_dir) / output_file)
         self.burn_progress = QtWidgets.QProgressDialog(
             "Burning subtitles...",
-            None,
-            0,
+            "Cancel",
             0,
+            100,
             self
         )
         self.burn_progress.setWindowTitle("Processing")
+        self.burn_progress.canceled.connect(self.cancel_burning)
         self.burn_progress.show()
-        self.burn_thread = threading.Thread(
-            target = self.run_burning,
-            args = (output_path, ),
-            daemon = True
-        )
-        self.burn_thread.start()
-
-
-    def run_burning(self, output_path):
+        self.video_process = None
         try:
-            videoprocess = ProcessVideo(
+            self.video_process = ProcessVideo(
                 self.video_path,
                 self.srt_path,
-                output_path
+                output_path,
+                progress = self.signals.progress.emit
             )
-            videoprocess.burn_subtitles()
+        except Exception as e:
+            self.on_burn_finished(None, error_message(e))
+            return
+        QThreadPool.globalInstance().start(
+            ProcessRunnable(self.run_burning, output_path, self.checkbox_soft.isChecked())
+        )
+
+
+    def run_burning(self, output_path, soft = False):
+        try:
+            self.video_process.burn_subtitles(soft)
             self.signals.burn_finished.emit(output_path, None)
         except Exception as e:
-            self.signals.burn_finished.emit(None, str(e))
+            self.signals.burn_finished.emit(None, error_message(e))
+
+
+    def cancel_burning(self):
+        if self.video_process is not None:
+            self.video_process.cancel()
+
+
+    def on_burn_progress(self, value):
+        self.burn_progress.setValue(value)
 
 
     def burn_subtitles(self, video_path, srt_path, output_path):
@@ -478,10 +986,12 @@ class PreviewWindow(QtWidgets.QMainWindow):
 
 
     def on_burn_finished(self, output_path, error = None):
+        cancelled = self.video_process is not None and self.video_process.cancelled
         self.burn_progress.close()
         self.button_finish.setEnabled(True)
         if error:
-            QtWidgets.QMessageBox.critical(self, "Error", error)
+            if not cancelled:
+                QtWidgets.QMessageBox.critical(self, "Error", error)
         else:
             QtWidgets.QMessageBox.information(
                 self,
@@ -504,6 +1014,7 @@ class PreviewWindow(QtWidgets.QMainWindow):
 
 
     def closeEvent(self, event):
+        self.position_timer.stop()
         self.media_player.stop()
         self.media_player.setMedia(QMediaContent())
         event.accept()
@@ -535,12 +1046,30 @@ class SuccessWindow(QtWidgets.QDialog):
         self.close()
 
 
+class ProcessRunnable(QRunnable):
+    def __init__(self, target, *args):
+        super().__init__()
+        self.target = target
+        self.args = args
+
+
+    def run(self):
+        self.target(*self.args)
+
+
 class Signals(QObject):
-    finished = pyqtSignal(str)
+    finished = pyqtSignal(str, str)
     error = pyqtSignal(str)
+    progress = pyqtSignal(int)
     burn_finished = pyqtSignal(str, str)
 
 
+def error_message(error):
+    if isinstance(error, ffmpeg.Error) and error.stderr:
+        return error.stderr.decode("utf-8", errors = "replace")
+    return str(error)
+
+
 def center_window(window):
     screen = window.screen()
     screen_geometry = screen.availableGeometry()